@@ -0,0 +1,379 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+secp256k1 Field / Point Arithmetic (compiled backend)
+=====================================================
+
+Optional Cython extension used by tests.py and secp256k1_math.py (table
+generation) when it has been built. Field elements are 4 x uint64 little-endian limbs;
+reduction uses the pseudo-Mersenne form P = 2^256 - 0x1000003D1, so the high
+half of a product is folded back with a single multiply by 0x1000003D1.
+
+Exposed:
+    scalar_mul(k, (x, y)) -> (x, y) or None (infinity)
+    gen_table(W)          -> [G, 3G, 5G, ..., (2^W - 1)G] as affine pairs
+
+Build:
+    python setup.py build_ext --inplace
+"""
+
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport malloc, free
+
+cdef extern from *:
+    """
+    typedef unsigned __int128 u128;
+    """
+    # Cython only needs an integer type name; the C side uses __int128
+    ctypedef unsigned long long u128
+
+# 2^256 mod P
+cdef uint64_t RC = 0x1000003D1ULL
+
+cdef uint64_t P0 = 0xFFFFFFFEFFFFFC2FULL
+cdef uint64_t PM = 0xFFFFFFFFFFFFFFFFULL
+
+# G in limbs
+cdef uint64_t GX_L[4]
+cdef uint64_t GY_L[4]
+GX_L[:] = [0x59F2815B16F81798ULL, 0x029BFCDB2DCE28D9ULL,
+           0x55A06295CE870B07ULL, 0x79BE667EF9DCBBACULL]
+GY_L[:] = [0x9C47D08FFB10D4B8ULL, 0xFD17B448A6855419ULL,
+           0x5DA4FBFC0E1108A8ULL, 0x483ADA7726A3C465ULL]
+
+
+# ---- Field ops (mod P) ----
+cdef inline void fe_copy(uint64_t *r, const uint64_t *a) noexcept nogil:
+    r[0] = a[0]; r[1] = a[1]; r[2] = a[2]; r[3] = a[3]
+
+
+cdef inline void fe_set_int(uint64_t *r, uint64_t v) noexcept nogil:
+    r[0] = v; r[1] = 0; r[2] = 0; r[3] = 0
+
+
+cdef inline bint fe_is_zero(const uint64_t *a) noexcept nogil:
+    return (a[0] | a[1] | a[2] | a[3]) == 0
+
+
+cdef inline bint fe_ge_p(const uint64_t *a) noexcept nogil:
+    return a[3] == PM and a[2] == PM and a[1] == PM and a[0] >= P0
+
+
+cdef inline void fe_add_rc(uint64_t *r) noexcept nogil:
+    # r += 2^256 - P (mod 2^256), i.e. r -= P when r >= P or after a carry
+    cdef u128 acc = <u128>r[0] + RC
+    r[0] = <uint64_t>acc; acc >>= 64
+    acc += r[1]; r[1] = <uint64_t>acc; acc >>= 64
+    acc += r[2]; r[2] = <uint64_t>acc; acc >>= 64
+    acc += r[3]; r[3] = <uint64_t>acc
+
+
+cdef inline void fe_add(uint64_t *r, const uint64_t *a, const uint64_t *b) noexcept nogil:
+    cdef u128 acc = 0
+    cdef int i
+    for i in range(4):
+        acc += <u128>a[i] + b[i]
+        r[i] = <uint64_t>acc
+        acc >>= 64
+    if acc or fe_ge_p(r):
+        fe_add_rc(r)
+
+
+cdef inline void fe_sub(uint64_t *r, const uint64_t *a, const uint64_t *b) noexcept nogil:
+    cdef uint64_t borrow = 0, ai, bi
+    cdef int i
+    for i in range(4):
+        ai = a[i]
+        bi = b[i]
+        r[i] = ai - bi - borrow
+        borrow = 1 if (ai < bi or (ai == bi and borrow)) else 0
+    if borrow:
+        # r += P, dropping the carry out of bit 256
+        fe_sub_rc(r)
+
+
+cdef inline void fe_sub_rc(uint64_t *r) noexcept nogil:
+    # r -= 2^256 - P (mod 2^256)
+    cdef uint64_t borrow, t
+    t = r[0]
+    r[0] = t - RC
+    borrow = 1 if t < RC else 0
+    t = r[1]; r[1] = t - borrow; borrow = 1 if t < borrow else 0
+    t = r[2]; r[2] = t - borrow; borrow = 1 if t < borrow else 0
+    r[3] = r[3] - borrow
+
+
+cdef inline void fe_reduce(uint64_t *r, const uint64_t *t) noexcept nogil:
+    # t is 512 bits; fold the high half with 2^256 = RC (mod P), twice
+    cdef u128 acc = 0
+    cdef uint64_t m[4]
+    cdef uint64_t top
+    cdef int i
+    for i in range(4):
+        acc += <u128>t[4 + i] * RC + t[i]
+        m[i] = <uint64_t>acc
+        acc >>= 64
+    top = <uint64_t>acc
+    acc = <u128>top * RC + m[0]
+    r[0] = <uint64_t>acc; acc >>= 64
+    for i in range(1, 4):
+        acc += m[i]
+        r[i] = <uint64_t>acc
+        acc >>= 64
+    if acc or fe_ge_p(r):
+        fe_add_rc(r)
+
+
+cdef inline void fe_mul(uint64_t *r, const uint64_t *a, const uint64_t *b) noexcept nogil:
+    cdef uint64_t t[8]
+    cdef u128 acc
+    cdef uint64_t carry
+    cdef int i, j
+    for i in range(8):
+        t[i] = 0
+    for i in range(4):
+        carry = 0
+        for j in range(4):
+            acc = <u128>a[i] * b[j] + t[i + j] + carry
+            t[i + j] = <uint64_t>acc
+            carry = <uint64_t>(acc >> 64)
+        t[i + 4] = carry
+    fe_reduce(r, t)
+
+
+cdef inline void fe_sqr(uint64_t *r, const uint64_t *a) noexcept nogil:
+    fe_mul(r, a, a)
+
+
+cdef void fe_inv(uint64_t *r, const uint64_t *a) noexcept nogil:
+    # Fermat: a^(P-2), square-and-multiply from the MSB
+    cdef uint64_t e[4]
+    cdef uint64_t acc[4]
+    cdef int i, bit
+    e[0] = P0 - 2; e[1] = PM; e[2] = PM; e[3] = PM
+    fe_set_int(acc, 1)
+    for i in range(255, -1, -1):
+        fe_sqr(acc, acc)
+        bit = (e[i >> 6] >> (i & 63)) & 1
+        if bit:
+            fe_mul(acc, acc, a)
+    fe_copy(r, acc)
+
+
+# ---- Jacobian point ops (Z = 0 = infinity) ----
+cdef void jac_double(uint64_t *X, uint64_t *Y, uint64_t *Z) noexcept nogil:
+    # EFD dbl-2009-l (a = 0), in place
+    cdef uint64_t A[4]
+    cdef uint64_t B[4]
+    cdef uint64_t C[4]
+    cdef uint64_t D[4]
+    cdef uint64_t E[4]
+    cdef uint64_t F[4]
+    cdef uint64_t t[4]
+    if fe_is_zero(Z) or fe_is_zero(Y):
+        fe_set_int(Z, 0)
+        return
+    fe_sqr(A, X)
+    fe_sqr(B, Y)
+    fe_sqr(C, B)
+    fe_add(t, X, B)
+    fe_sqr(t, t)
+    fe_sub(t, t, A)
+    fe_sub(t, t, C)
+    fe_add(D, t, t)
+    fe_add(E, A, A)
+    fe_add(E, E, A)
+    fe_sqr(F, E)
+    # Z3 = 2*Y1*Z1 (before Y is overwritten)
+    fe_mul(Z, Y, Z)
+    fe_add(Z, Z, Z)
+    # X3 = F - 2D
+    fe_sub(X, F, D)
+    fe_sub(X, X, D)
+    # Y3 = E*(D - X3) - 8C
+    fe_sub(t, D, X)
+    fe_mul(Y, E, t)
+    fe_add(C, C, C)
+    fe_add(C, C, C)
+    fe_add(C, C, C)
+    fe_sub(Y, Y, C)
+
+
+cdef void jac_add_mixed(uint64_t *X, uint64_t *Y, uint64_t *Z,
+                        const uint64_t *x2, const uint64_t *y2) noexcept nogil:
+    # EFD madd-2007-bl: Jacobian += affine (Z2 = 1), in place
+    cdef uint64_t Z1Z1[4]
+    cdef uint64_t U2[4]
+    cdef uint64_t S2[4]
+    cdef uint64_t H[4]
+    cdef uint64_t HH[4]
+    cdef uint64_t I[4]
+    cdef uint64_t J[4]
+    cdef uint64_t rr[4]
+    cdef uint64_t V[4]
+    cdef uint64_t t[4]
+    if fe_is_zero(Z):
+        fe_copy(X, x2)
+        fe_copy(Y, y2)
+        fe_set_int(Z, 1)
+        return
+    fe_sqr(Z1Z1, Z)
+    fe_mul(U2, x2, Z1Z1)
+    fe_mul(S2, y2, Z)
+    fe_mul(S2, S2, Z1Z1)
+    fe_sub(H, U2, X)
+    fe_sub(rr, S2, Y)
+    fe_add(rr, rr, rr)
+    if fe_is_zero(H):
+        if fe_is_zero(rr):
+            jac_double(X, Y, Z)
+        else:
+            fe_set_int(Z, 0)
+        return
+    fe_sqr(HH, H)
+    fe_add(I, HH, HH)
+    fe_add(I, I, I)
+    fe_mul(J, H, I)
+    fe_mul(V, X, I)
+    # Z3 = (Z1 + H)^2 - Z1Z1 - HH
+    fe_add(t, Z, H)
+    fe_sqr(t, t)
+    fe_sub(t, t, Z1Z1)
+    fe_sub(Z, t, HH)
+    # X3 = rr^2 - J - 2V
+    fe_sqr(t, rr)
+    fe_sub(t, t, J)
+    fe_sub(t, t, V)
+    fe_sub(X, t, V)
+    # Y3 = rr*(V - X3) - 2*Y1*J
+    fe_mul(J, Y, J)
+    fe_add(J, J, J)
+    fe_sub(t, V, X)
+    fe_mul(t, rr, t)
+    fe_sub(Y, t, J)
+
+
+# ---- Python boundary ----
+cdef void fe_from_int(uint64_t *r, object v):
+    v = int(v)
+    r[0] = <uint64_t>(v & 0xFFFFFFFFFFFFFFFF)
+    r[1] = <uint64_t>((v >> 64) & 0xFFFFFFFFFFFFFFFF)
+    r[2] = <uint64_t>((v >> 128) & 0xFFFFFFFFFFFFFFFF)
+    r[3] = <uint64_t>((v >> 192) & 0xFFFFFFFFFFFFFFFF)
+
+
+cdef object fe_to_int(const uint64_t *a):
+    return (int(a[0]) | (int(a[1]) << 64) | (int(a[2]) << 128)
+            | (int(a[3]) << 192))
+
+
+cdef object jac_to_affine(const uint64_t *X, const uint64_t *Y, const uint64_t *Z):
+    cdef uint64_t zinv[4]
+    cdef uint64_t zinv2[4]
+    cdef uint64_t x[4]
+    cdef uint64_t y[4]
+    if fe_is_zero(Z):
+        return None
+    fe_inv(zinv, Z)
+    fe_sqr(zinv2, zinv)
+    fe_mul(x, X, zinv2)
+    fe_mul(y, Y, zinv2)
+    fe_mul(y, y, zinv)
+    return (fe_to_int(x), fe_to_int(y))
+
+
+def scalar_mul(k, Pt):
+    """k*Pt by double-and-add on a Jacobian accumulator (k >= 0, < 2^256)."""
+    cdef uint64_t kl[4]
+    cdef uint64_t x2[4]
+    cdef uint64_t y2[4]
+    cdef uint64_t X[4]
+    cdef uint64_t Y[4]
+    cdef uint64_t Z[4]
+    cdef int i
+    if not 0 <= k < (1 << 256):
+        raise ValueError("scalar must be in [0, 2^256)")
+    if Pt is None:
+        return None
+    fe_from_int(kl, k)
+    fe_from_int(x2, Pt[0])
+    fe_from_int(y2, Pt[1])
+    fe_set_int(X, 1)
+    fe_set_int(Y, 1)
+    fe_set_int(Z, 0)
+    with nogil:
+        for i in range(255, -1, -1):
+            jac_double(X, Y, Z)
+            if (kl[i >> 6] >> (i & 63)) & 1:
+                jac_add_mixed(X, Y, Z, x2, y2)
+    return jac_to_affine(X, Y, Z)
+
+
+def gen_table(int W):
+    """Odd multiples G, 3G, ..., (2^W - 1)G with one batch inversion."""
+    # 64-bit counters: 12 * num overflows int for W >= 29
+    cdef Py_ssize_t num
+    cdef Py_ssize_t i
+    cdef uint64_t X[4]
+    cdef uint64_t Y[4]
+    cdef uint64_t Z[4]
+    cdef uint64_t tx[4]
+    cdef uint64_t ty[4]
+    cdef uint64_t t[4]
+    cdef uint64_t zinv[4]
+    cdef uint64_t zinv2[4]
+    cdef uint64_t *jac
+    cdef uint64_t *acc
+
+    if not 1 <= W <= 30:
+        raise ValueError("W must be in [1, 30]")
+    num = <Py_ssize_t>1 << (W - 1)
+
+    # 2G in affine
+    fe_copy(X, GX_L)
+    fe_copy(Y, GY_L)
+    fe_set_int(Z, 1)
+    jac_double(X, Y, Z)
+    fe_inv(zinv, Z)
+    fe_sqr(zinv2, zinv)
+    fe_mul(tx, X, zinv2)
+    fe_mul(ty, Y, zinv2)
+    fe_mul(ty, ty, zinv)
+
+    jac = <uint64_t *>malloc(<size_t>num * 12 * sizeof(uint64_t))
+    acc = <uint64_t *>malloc(<size_t>num * 4 * sizeof(uint64_t))
+    if jac == NULL or acc == NULL:
+        free(jac)
+        free(acc)
+        raise MemoryError()
+    try:
+        with nogil:
+            fe_copy(X, GX_L)
+            fe_copy(Y, GY_L)
+            fe_set_int(Z, 1)
+            for i in range(num):
+                fe_copy(&jac[12 * i], X)
+                fe_copy(&jac[12 * i + 4], Y)
+                fe_copy(&jac[12 * i + 8], Z)
+                jac_add_mixed(X, Y, Z, tx, ty)
+
+            # Montgomery's trick: prefix products, one inversion, sweep back
+            fe_copy(&acc[0], &jac[8])
+            for i in range(1, num):
+                fe_mul(&acc[4 * i], &acc[4 * (i - 1)], &jac[12 * i + 8])
+            fe_inv(t, &acc[4 * (num - 1)])
+            for i in range(num - 1, -1, -1):
+                if i > 0:
+                    fe_mul(zinv, t, &acc[4 * (i - 1)])
+                    fe_mul(t, t, &jac[12 * i + 8])
+                else:
+                    fe_copy(zinv, t)
+                fe_sqr(zinv2, zinv)
+                fe_mul(&jac[12 * i], &jac[12 * i], zinv2)
+                fe_mul(zinv2, zinv2, zinv)
+                fe_mul(&jac[12 * i + 4], &jac[12 * i + 4], zinv2)
+
+        return [(fe_to_int(&jac[12 * i]), fe_to_int(&jac[12 * i + 4]))
+                for i in range(num)]
+    finally:
+        free(jac)
+        free(acc)
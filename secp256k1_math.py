@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+secp256k1 Curve Math
+====================
+
+Field and point arithmetic shared by gen_secp256k1_wnaf_table.py and tests.py.
+
+Contents:
+    P, GX, GY, INF      Curve parameters; INF (None) is the point at infinity
+    inv(a, m=P)         Inverse mod m (P by default)
+    add, dbl            Affine point addition and doubling
+    jac_double,         Jacobian (X, Y, Z) accumulator; normalize once with
+    jac_add_mixed,      jac_to_affine (or batch_inv for many points)
+    jac_to_affine
+    batch_inv,          Montgomery's trick: N inverses for one inversion
+    batch_to_affine
+    gen_table(W)        wNAF odd multiples G, 3G, ..., (2^W - 1)G
+
+Uses gmpy2 and the secp256k1_field extension when available.
+
+Author: Bruno Silva (bsbruno@proton.me)
+"""
+
+# gmpy2 opcional: aritmética GMP se disponível, senão int puro
+try:
+    from gmpy2 import mpz, invert
+except ImportError:
+    mpz = int
+    invert = None
+
+# extensão Cython opcional (secp256k1_field.pyx)
+try:
+    from secp256k1_field import gen_table as _gen_table_ext
+except ImportError:
+    _gen_table_ext = None
+
+# secp256k1 curve parameters
+P  = mpz(0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F)
+GX = mpz(0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798)
+GY = mpz(0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+
+def inv(a, m=P):  # inverso mod m (Euclides estendido), m = P por padrão
+    a %= m
+    if a == 0:
+        raise ZeroDivisionError("inverse of 0")
+    if invert is not None:
+        return invert(a, m)
+    t, newt = 0, 1
+    r, newr = m, a
+    while newr != 0:
+        q = r // newr
+        t, newt = newt, t - q*newt
+        r, newr = newr, r - q*newr
+    if r != 1:
+        raise ZeroDivisionError("not invertible")
+    return t % m
+
+INF = None  # ponto no infinito
+
+def add(P1, P2):
+    if P1 is INF: return P2
+    if P2 is INF: return P1
+    x1,y1 = P1
+    x2,y2 = P2
+    if x1 == x2:
+        if (y1 + y2) % P == 0:
+            return INF
+        # P1==P2 => doubling
+        return dbl(P1)
+    lam = ((y2 - y1) * inv((x2 - x1) % P)) % P
+    x3 = (lam*lam - x1 - x2) % P
+    y3 = (lam*(x1 - x3) - y1) % P
+    return (x3,y3)
+
+def dbl(P1):
+    if P1 is INF: return INF
+    x1,y1 = P1
+    if y1 == 0: return INF
+    lam = ((3*x1*x1) * inv((2*y1) % P)) % P
+    x3 = (lam*lam - 2*x1) % P
+    y3 = (lam*(x1 - x3) - y1) % P
+    return (x3,y3)
+
+JAC_INF = (1, 1, 0)  # jacobiano (X,Y,Z) ~ (X/Z^2, Y/Z^3); Z=0 => infinito
+
+def jac_double(X1, Y1, Z1):
+    # EFD dbl-2009-l (a=0), sem inv()
+    if Z1 == 0 or Y1 == 0:
+        return JAC_INF
+    A = X1*X1 % P
+    B = Y1*Y1 % P
+    C = B*B % P
+    D = 2*((X1 + B)*(X1 + B) - A - C) % P
+    E = 3*A % P
+    F = E*E % P
+    X3 = (F - 2*D) % P
+    Y3 = (E*(D - X3) - 8*C) % P
+    Z3 = 2*Y1*Z1 % P
+    return (X3,Y3,Z3)
+
+def jac_add_mixed(X1, Y1, Z1, x2, y2):
+    # mixed add (EFD madd-2007-bl): (X1,Y1,Z1) jacobiano + (x2,y2) afim (Z2=1), sem inv()
+    # 7M + 4S contra 11M + 5S do add-2007-bl genérico (Z2 != 1)
+    if Z1 == 0:
+        return (x2,y2,mpz(1))
+    Z1Z1 = Z1*Z1 % P
+    U2 = x2*Z1Z1 % P
+    S2 = y2*Z1*Z1Z1 % P
+    H = (U2 - X1) % P
+    r = 2*(S2 - Y1) % P
+    if H == 0:
+        if r == 0:
+            return jac_double(X1, Y1, Z1)
+        return JAC_INF
+    HH = H*H % P
+    I = 4*HH % P
+    Jm = H*I % P
+    V = X1*I % P
+    X3 = (r*r - Jm - 2*V) % P
+    Y3 = (r*(V - X3) - 2*Y1*Jm) % P
+    Z3 = ((Z1 + H)*(Z1 + H) - Z1Z1 - HH) % P
+    return (X3,Y3,Z3)
+
+def jac_to_affine(X, Y, Z):
+    # normaliza com uma única inversão
+    if Z == 0:
+        return INF
+    if Z == 1:
+        return (X,Y)
+    zinv = inv(Z)
+    zinv2 = zinv*zinv % P
+    return (X*zinv2 % P, Y*zinv2*zinv % P)
+
+def batch_inv(zs):
+    # truque de Montgomery: 1 inversão + 3(N-1) multiplicações
+    acc = []
+    a = mpz(1)
+    for z in zs:
+        a = a*z % P
+        acc.append(a)
+    t = inv(acc[-1])
+    out = [0]*len(zs)
+    for i in range(len(zs)-1, 0, -1):
+        out[i] = t*acc[i-1] % P
+        t = t*zs[i] % P
+    out[0] = t
+    return out
+
+def batch_to_affine(jac):
+    # normaliza uma lista de pontos jacobianos (Z != 0) com uma única inversão
+    zinvs = batch_inv([Z for (_,_,Z) in jac])
+    pts = []
+    for (X,Y,_), zinv in zip(jac, zinvs):
+        zinv2 = zinv*zinv % P
+        pts.append((X*zinv2 % P, Y*zinv2*zinv % P))
+    return pts
+
+def gen_table(W):
+    if _gen_table_ext is not None:
+        return _gen_table_ext(W)
+    num = 1 << (W-1)
+    G = (GX,GY)
+    gx2, gy2 = dbl(G)  # 2G afim, calculado uma vez
+
+    jac = []
+    cur = (GX,GY,mpz(1))  # 1G em jacobiano
+    for _ in range(num):
+        jac.append(cur)
+        cur = jac_add_mixed(*cur, gx2, gy2)  # +2G => próximo ímpar
+
+    return batch_to_affine(jac)
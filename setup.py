@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Build script for the optional secp256k1_field Cython extension.
+
+Usage:
+    python setup.py build_ext --inplace
+
+tests.py and gen_secp256k1_wnaf_table.py pick the extension up automatically
+when it is importable and fall back to pure Python otherwise.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="secp256k1_field",
+    ext_modules=cythonize(
+        [
+            Extension(
+                "secp256k1_field",
+                ["secp256k1_field.pyx"],
+                extra_compile_args=["-O3", "-march=native"],
+            )
+        ],
+        language_level=3,
+    ),
+)
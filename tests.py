@@ -4,16 +4,21 @@ secp256k1 Verification Test Suite
 =================================
 
 Pure Python implementation for verifying secp256k1 elliptic curve operations.
-No external dependencies required.
+No external dependencies required. Optional accelerators are picked up when
+available: gmpy2 for big-integer arithmetic, coincurve (libsecp256k1) for k*G
+and ECDSA verify, and the secp256k1_field Cython extension for other scalar
+multiplications (python setup.py build_ext --inplace).
 
 Test Coverage:
     1. Curve sanity checks (G on curve, -G calculation)
     2. Known scalar multiplication vectors: k = 1, 2, 3, 7, 8, 255
     3. Group order checks: n*G = infinity, (n-1)*G = -G
-    4. ECDSA sign/verify with RFC6979 deterministic nonce
+    4. GLV endomorphism: phi(G) = lambda*G, scalar split
+    5. ECDSA sign/verify with RFC6979 deterministic nonce
 
 Usage:
-    python tests.py
+    python tests.py          # use optional accelerators if installed
+    python tests.py --pure   # pure-Python reference path only
 
 Expected Output:
     ALL TESTS PASSED.
@@ -26,14 +31,43 @@ Author: Bruno Silva (bsbruno@proton.me)
 
 import hashlib
 import hmac
+import sys
 from typing import Optional, Tuple
 
-# ---- Curve params (from your Verilog) ----
-P = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F", 16)
-N = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141", 16)
+from secp256k1_math import (
+    GX,
+    GY,
+    JAC_INF,
+    P,
+    add as point_add,
+    batch_to_affine,
+    dbl as point_double,
+    inv,
+    invert,
+    jac_add_mixed,
+    jac_double,
+    jac_to_affine,
+    mpz,
+)
+
+try:
+    from secp256k1_field import gen_table as _gen_table_ext
+    from secp256k1_field import scalar_mul as _scalar_mul_ext
+except ImportError:  # extension not built
+    _gen_table_ext = _scalar_mul_ext = None
+
+try:
+    from coincurve import PublicKey
+    from coincurve.ecdsa import cdata_to_der, deserialize_compact
+except ImportError:  # libsecp256k1 bindings not installed
+    PublicKey = None
+
+# Set by --pure: ignore coincurve / secp256k1_field and run the Python oracle
+PURE = False
 
-GX = int("79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798", 16)
-GY = int("483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8", 16)
+# ---- Curve params (from your Verilog) ----
+# P, GX, GY come from secp256k1_math
+N = mpz("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141", 16)
 
 NEG_GY = int("B7C52588D95C3B9AA25B0403F1EEF75702E84BB7597AABE663B82F6F04EF2777", 16)
 
@@ -61,25 +95,24 @@ VECTORS = {
     ),
 }
 
+# GLV endomorphism: phi(x, y) = (BETA*x, y) = LAMBDA*(x, y)
+BETA = mpz("7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE", 16)
+LAMBDA = mpz("5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72", 16)
+
+# Short lattice basis for the scalar split: (A1, B1), (A2, B2)
+GLV_A1 = mpz("3086D221A7D46BCDE86C90E49284EB15", 16)
+GLV_B1 = -mpz("E4437ED6010E88286F547FA90ABFE4C3", 16)
+GLV_A2 = mpz("114CA50F7A8E2F3F657C1108D9D44CFD8", 16)
+GLV_B2 = GLV_A1
+
 Point = Optional[Tuple[int, int]]  # None = infinity
+JacPoint = Tuple[int, int, int]  # (X, Y, Z), Z = 0 = infinity
 
 
 # ---- Math helpers ----
-def mod_inv(a: int, m: int) -> int:
-    """Inverse via extended Euclid. Raises if non-invertible."""
-    a %= m
-    if a == 0:
-        raise ZeroDivisionError("inverse of 0")
-    # Extended Euclid
-    t, newt = 0, 1
-    r, newr = m, a
-    while newr != 0:
-        q = r // newr
-        t, newt = newt, t - q * newt
-        r, newr = newr, r - q * newr
-    if r != 1:
-        raise ZeroDivisionError("not invertible")
-    return t % m
+def mod_inv(a: int) -> int:
+    """Inverse mod N. Raises if non-invertible."""
+    return inv(a, N)
 
 
 def is_on_curve(Pt: Point) -> bool:
@@ -99,51 +132,148 @@ def point_neg(Pt: Point) -> Point:
     return (x, (-y) % P)
 
 
-def point_add(A: Point, B: Point) -> Point:
-    if A is None:
-        return B
-    if B is None:
-        return A
-    x1, y1 = A
-    x2, y2 = B
+WNAF_W = 5
 
-    if x1 == x2:
-        if (y1 + y2) % P == 0:
-            return None
-        # A == B (doubling)
-        return point_double(A)
 
-    lam = ((y2 - y1) * mod_inv(x2 - x1, P)) % P
-    x3 = (lam * lam - x1 - x2) % P
-    y3 = (lam * (x1 - x3) - y1) % P
-    return (x3, y3)
+def wnaf(k: int, w: int) -> list:
+    """Width-w NAF digits of k, LSB first (HMV Algorithm 3.30)."""
+    digits = []
+    while k > 0:
+        if k & 1:
+            d = k & ((1 << w) - 1)
+            if d >= 1 << (w - 1):
+                d -= 1 << w
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
 
 
-def point_double(A: Point) -> Point:
-    if A is None:
-        return None
-    x1, y1 = A
-    if y1 == 0:
+def phi(Pt: Point) -> Point:
+    """secp256k1 endomorphism: (x, y) -> (BETA*x, y), equal to LAMBDA*Pt."""
+    if Pt is None:
         return None
-    lam = ((3 * x1 * x1) * mod_inv(2 * y1, P)) % P
-    x3 = (lam * lam - 2 * x1) % P
-    y3 = (lam * (x1 - x3) - y1) % P
-    return (x3, y3)
+    x, y = Pt
+    return ((BETA * x) % P, y)
 
 
-def scalar_mul(k: int, Pt: Point) -> Point:
-    """Double-and-add (left-to-right)."""
+def wnaf_tables(Pt: Point) -> tuple:
+    """
+    Odd multiples [P, 3P, ..., (2^(WNAF_W-1)-1)P] with their negations and
+    phi images: (pos, neg, phi_pos, phi_neg), built once per call. k*G terms
+    never get here; they use the comb table.
+    """
+    x, y = Pt
+    # P, 2P, 3P, ..., (2^(WNAF_W-1)-1)P in Jacobian form; one inversion at the end
+    jac = [(x, y, mpz(1))]
+    jac.append(jac_double(*jac[0]))
+    while len(jac) < (1 << (WNAF_W - 1)) - 1:
+        jac.append(jac_add_mixed(*jac[-1], x, y))
+    pos = batch_to_affine(jac[::2])
+    phi_pos = [phi(Q) for Q in pos]
+    return (pos, [point_neg(Q) for Q in pos],
+            phi_pos, [point_neg(Q) for Q in phi_pos])
+
+
+def split_scalar(k: int) -> Tuple[int, int]:
+    """GLV split k = k1 + k2*LAMBDA (mod N) with |k1|, |k2| ~ sqrt(N)."""
+    c1 = (2 * GLV_B2 * k + N) // (2 * N)
+    c2 = (-2 * GLV_B1 * k + N) // (2 * N)
+    k1 = k - c1 * GLV_A1 - c2 * GLV_A2
+    k2 = -c1 * GLV_B1 - c2 * GLV_B2
+    return k1, k2
+
+
+COMB_W = 8
+_comb_table = []  # _comb_table[i][j] = j * 2^(COMB_W*i) * G (affine)
+
+
+def comb_table() -> list:
+    """Fixed-base comb rows for G, built once (one batch inversion per row)."""
+    if not _comb_table:
+        base = (GX, GY)
+        for _ in range(256 // COMB_W):
+            jac = [(base[0], base[1], mpz(1))]
+            for _ in range((1 << COMB_W) - 2):
+                jac.append(jac_add_mixed(*jac[-1], *base))
+            row = [None] + batch_to_affine(jac)
+            _comb_table.append(row)
+            base = point_add(row[-1], base)
+    return _comb_table
+
+
+def _comb_add(R: JacPoint, k: int) -> JacPoint:
+    """R + k*G with the comb table: one mixed add per scalar byte, no doublings."""
+    for row in comb_table():
+        d = k & ((1 << COMB_W) - 1)
+        k >>= COMB_W
+        if d:
+            R = jac_add_mixed(*R, *row[d])
+    return R
+
+
+def _comb_jac(k: int) -> JacPoint:
+    """k*G via the comb table."""
+    return _comb_add(JAC_INF, k)
+
+
+def multi_scalar_jac(pairs: list) -> JacPoint:
+    """
+    sum(k_i * P_i) in Jacobian form, no normalization (Straus/Shamir).
+    Every non-G term is GLV-split and its wNAF digits share one doubling
+    chain; k*G terms are added from the comb table after the chain.
+    """
+    streams = []
+    fixed = 0
+    for k, Pt in pairs:
+        k %= N
+        if k == 0 or Pt is None:
+            continue
+        if Pt == (GX, GY):
+            fixed += k
+            continue
+        k1, k2 = split_scalar(k)
+        pos1, neg1, pos2, neg2 = wnaf_tables(Pt)
+        for kk, pos, neg in ((k1, pos1, neg1), (k2, pos2, neg2)):
+            # negative half-scalar => negate the base point instead
+            if kk < 0:
+                kk, pos, neg = -kk, neg, pos
+            streams.append((wnaf(kk, WNAF_W), pos, neg))
+    R = JAC_INF
+    for i in range(max((len(d) for d, _, _ in streams), default=0) - 1, -1, -1):
+        R = jac_double(*R)
+        for digits, pos, neg in streams:
+            d = digits[i] if i < len(digits) else 0
+            if d > 0:
+                R = jac_add_mixed(*R, *pos[d >> 1])
+            elif d < 0:
+                R = jac_add_mixed(*R, *neg[(-d) >> 1])
+    return _comb_add(R, fixed % N)
+
+
+def scalar_mul_jac(k: int, Pt: Point) -> JacPoint:
+    """k*Pt left in Jacobian form (backends return Z = 1)."""
     k %= N  # standard in ECDSA context; for pure group mul you could use k%N too.
     if k == 0 or Pt is None:
-        return None
-    R = None
-    Q = Pt
-    while k > 0:
-        if k & 1:
-            R = point_add(R, Q)
-        Q = point_double(Q)
-        k >>= 1
-    return R
+        return JAC_INF
+    if not PURE:
+        R = None
+        if PublicKey is not None and Pt == (GX, GY):
+            R = PublicKey.from_secret(int(k).to_bytes(32, "big")).point()
+        elif _scalar_mul_ext is not None:
+            R = _scalar_mul_ext(k, Pt)
+        if R is not None:
+            return (R[0], R[1], 1)
+    if Pt == (GX, GY):
+        return _comb_jac(k)
+    return multi_scalar_jac([(k, Pt)])
+
+
+def scalar_mul(k: int, Pt: Point) -> Point:
+    """GLV split + interleaved wNAF (comb for G), normalized once."""
+    return jac_to_affine(*scalar_mul_jac(k, Pt))
 
 
 # ---- RFC6979 deterministic k for ECDSA (HMAC-SHA256) ----
@@ -151,7 +281,7 @@ def rfc6979_k(privkey: int, h1: bytes) -> int:
     """
     RFC6979 for curve order N using HMAC-SHA256.
     """
-    x = privkey.to_bytes(32, "big")
+    x = int(privkey).to_bytes(32, "big")
     qlen = N.bit_length()
     holen = hashlib.sha256().digest_size
     rolen = (qlen + 7) // 8
@@ -164,7 +294,7 @@ def rfc6979_k(privkey: int, h1: bytes) -> int:
         return i
 
     def int2octets(v: int) -> bytes:
-        return v.to_bytes(rolen, "big")
+        return int(v).to_bytes(rolen, "big")
 
     def bits2octets(b: bytes) -> bytes:
         z1 = bits2int(b)
@@ -196,12 +326,13 @@ def ecdsa_sign(privkey: int, msg: bytes) -> Tuple[int, int]:
         raise ValueError("bad privkey")
     z = hashlib.sha256(msg).digest()
     k = rfc6979_k(privkey, z)
-    R = scalar_mul(k, (GX, GY))
-    assert R is not None
-    r = R[0] % N
+    X, _, Z = scalar_mul_jac(k, (GX, GY))
+    assert Z != 0
+    zinv = inv(Z)
+    r = (X * zinv * zinv % P) % N
     if r == 0:
         raise RuntimeError("r=0, retry (shouldn't with RFC6979 normally)")
-    s = (mod_inv(k, N) * ((int.from_bytes(z, "big") % N) + r * privkey)) % N
+    s = (mod_inv(k) * ((int.from_bytes(z, "big") % N) + r * privkey)) % N
     if s == 0:
         raise RuntimeError("s=0, retry")
     return r, s
@@ -213,26 +344,53 @@ def ecdsa_verify(pub: Point, msg: bytes, sig: Tuple[int, int]) -> bool:
     r, s = sig
     if not (1 <= r < N and 1 <= s < N):
         return False
+    if not PURE and PublicKey is not None:
+        # libsecp256k1 only accepts low-S; (r, s) and (r, N-s) are equivalent
+        if s > N // 2:
+            s = N - s
+        der = cdata_to_der(deserialize_compact(
+            int(r).to_bytes(32, "big") + int(s).to_bytes(32, "big")))
+        return PublicKey.from_point(int(pub[0]), int(pub[1])).verify(der, msg)
     z = int.from_bytes(hashlib.sha256(msg).digest(), "big") % N
-    w = mod_inv(s, N)
+    w = mod_inv(s)
     u1 = (z * w) % N
     u2 = (r * w) % N
-    P1 = scalar_mul(u1, (GX, GY))
-    P2 = scalar_mul(u2, pub)
-    X = point_add(P1, P2)
-    if X is None:
+    X, _, Z = multi_scalar_jac([(u1, (GX, GY)), (u2, pub)])
+    if Z == 0:
         return False
-    return (X[0] % N) == r
+    # x(R) mod N == r  <=>  X == r*Z^2 or (r+N)*Z^2 (mod P); no inversion
+    zz = Z * Z % P
+    if X == r * zz % P:
+        return True
+    return r + N < P and X == (r + N) * zz % P
 
 
 # ---- Tests ----
 def hex256(x: int) -> str:
-    return f"{x:064x}"
+    return f"{int(x):064x}"
+
+
+def pure_call(fn, *args):
+    """fn(*args) with coincurve / secp256k1_field disabled (the Python oracle)."""
+    global PURE
+    saved, PURE = PURE, True
+    try:
+        return fn(*args)
+    finally:
+        PURE = saved
 
 
 def main():
     G = (GX, GY)
 
+    if PURE:
+        print("backend: pure Python" + (" (gmpy2 integers)" if invert is not None else ""))
+    else:
+        ext = [name for name, mod in (("coincurve", PublicKey),
+                                      ("secp256k1_field", _scalar_mul_ext),
+                                      ("gmpy2", invert)) if mod is not None]
+        print("backend:", ", ".join(ext) or "pure Python")
+
     print("=== Curve sanity ===")
     assert P > 3 and N > 3
     assert is_on_curve(G), "G not on curve!"
@@ -253,6 +411,13 @@ def main():
             print(" expected y:", hex256(ey))
             print(" got      y:", hex256(y))
             raise SystemExit(1)
+    if not PURE:
+        # backends against the Python oracle, for G (comb) and 2G (GLV + wNAF)
+        G2 = VECTORS[2]
+        for k in VECTORS:
+            assert pure_call(scalar_mul, k, G) == scalar_mul(k, G), f"k={k}: backend != oracle"
+            assert pure_call(scalar_mul, k, G2) == scalar_mul(k, G2), f"k={k}: backend != oracle (2G)"
+        print("PASS: backends match the pure-Python oracle")
 
     print("\n=== Classic group checks ===")
     # n*G = infinity
@@ -261,8 +426,44 @@ def main():
     # (n-1)*G = -G
     Rnm1 = scalar_mul(N - 1, G)
     assert Rnm1 == (GX, NEG_GY), "(n-1)*G should be -G"
+    if not PURE:
+        assert pure_call(scalar_mul, N - 1, G) == Rnm1, "(n-1)*G: backend != oracle"
     print("PASS: n*G=inf and (n-1)*G=-G")
 
+    if not PURE and _scalar_mul_ext is not None:
+        print("\n=== secp256k1_field input checks ===")
+        for bad in (-1, 1 << 256):
+            try:
+                _scalar_mul_ext(bad, G)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"scalar_mul accepted k={bad}")
+        assert _scalar_mul_ext((1 << 256) - 1, G) == scalar_mul((1 << 256) - 1, G)
+        for bad in (0, 31):
+            try:
+                _gen_table_ext(bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"gen_table accepted W={bad}")
+        tbl = _gen_table_ext(4)
+        assert tbl == [pure_call(scalar_mul, 2 * i + 1, G) for i in range(8)], "gen_table mismatch"
+        print("PASS: out-of-range scalars and widths rejected, gen_table(4) matches")
+
+    print("\n=== GLV endomorphism ===")
+    R = None  # plain double-and-add, independent of the GLV path
+    for bit in bin(LAMBDA)[2:]:
+        R = point_double(R)
+        if bit == "1":
+            R = point_add(R, G)
+    assert phi(G) == R, "phi(G) should be lambda*G"
+    k = N - 0x1234567
+    k1, k2 = split_scalar(k)
+    assert (k1 + k2 * LAMBDA - k) % N == 0, "bad GLV split"
+    assert max(abs(k1), abs(k2)).bit_length() <= 129, "GLV split not short"
+    print("PASS: phi(G)=lambda*G and k=k1+k2*lambda")
+
     print("\n=== ECDSA sign/verify test ===")
     priv = 0x123456789ABCDEF123456789ABCDEF123456789ABCDEF123456789ABCDEF1234 % N
     if priv == 0:
@@ -280,9 +481,23 @@ def main():
     print("sig s=", hex256(sig[1]))
     print("verify:", "PASS" if ok else "FAIL")
     assert ok
+    if not PURE:
+        assert pure_call(ecdsa_sign, priv, msg) == sig, "sign: backend != oracle"
+        assert pure_call(ecdsa_verify, pub, msg, sig), "verify: oracle rejects signature"
+
+    # Straus/Shamir path and the inversion-free x(R) check, always in Python
+    u1, u2 = 0x1234567 * LAMBDA % N, N - 0xABCDEF
+    R = jac_to_affine(*multi_scalar_jac([(u1, G), (u2, pub)]))
+    assert R == point_add(scalar_mul(u1, G), scalar_mul(u2, pub)), "multi_scalar_jac mismatch"
+    bad = (sig[0], sig[1] % (N - 1) + 1)
+    assert not ecdsa_verify(pub, msg, bad), "bad signature accepted"
+    assert not pure_call(ecdsa_verify, pub, msg, bad), "bad signature accepted (pure)"
+    assert not pure_call(ecdsa_verify, pub, b"other message", sig), "wrong message accepted (pure)"
+    print("PASS: multi_scalar_jac and bad-signature rejection")
 
     print("\nALL TESTS PASSED.")
 
 
 if __name__ == "__main__":
+    PURE = "--pure" in sys.argv[1:]
     main()